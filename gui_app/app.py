@@ -1,55 +1,444 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
+from flask import Flask, Response, render_template, request, redirect, url_for, flash, jsonify, g, has_request_context, session
+from flask_caching import Cache
 import sqlite3
-import os
-import json
+import logging
+import orjson
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 # Import the new function from the local module
-from .normalize_compound import get_compound_data
+from .normalize_compound import compress_svg, decompress_svg, fingerprint_from_bitstring, get_compound_data
+
+# DEBUG output is opt-in; the default level keeps request paths quiet
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 # A secret key is needed for flashing messages
 app.secret_key = 'a_random_secret_key'
 
+# --- Page Cache ---
+# Rendered pages are kept in process memory. The dashboard count is the only
+# thing that changes once a page has been rendered, so INDEX_CACHE_KEY is
+# dropped whenever a compound is added.
+app.config['CACHE_TYPE'] = 'SimpleCache'
+cache = Cache(app)
+INDEX_CACHE_KEY = 'view/index'
+
+def _has_pending_flashes():
+    # Flashed messages are part of the rendered page, so such a response must
+    # neither be served from the cache nor stored in it
+    return '_flashes' in session
+
+def _skip_page_cache():
+    # Called by cached views when the page reports an error, which must not be
+    # served to the next visitor
+    g.skip_page_cache = True
+
+def _is_rendered_page(rv):
+    # Only clean successful renders are cached, never redirects (e.g. compound
+    # not found) or pages showing an error
+    return isinstance(rv, str) and not g.get('skip_page_cache')
+
 # --- Database Configuration ---
-# Get the absolute path for the database file
-DATABASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'database.db')
+# Resolve the project directory once, with any '..' already removed, so every
+# connect hands SQLite a clean absolute path
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATABASE_PATH = str(BASE_DIR / 'database.db')
+SCHEMA_PATH = str(BASE_DIR / 'schema.sql')
+# mode=rwc keeps the create-if-missing behaviour of a plain path
+DATABASE_URI = f"{Path(DATABASE_PATH).as_uri()}?mode=rwc"
+
+# --- SQL ---
+# Statements are kept as module constants so every request passes the same
+# text to sqlite3, which then reuses its cached prepared statement.
+# Maintained by the compounds_count_* triggers in schema.sql
+COUNT_COMPOUNDS_SQL = "SELECT value FROM compounds_stats WHERE key = 'count'"
+
+# Duplicate checks in order of precedence: InChIKey (most reliable), normalized
+# SMILES, raw SMILES, then common name. Each entry is (data key, condition,
+# label used in the flash message).
+DUP_CHECKS = (
+    ('inchi_key', "inchi_key = ?", 'InChIKey'),
+    ('smiles_normalized', "smiles_normalized = ?", 'normalized SMILES'),
+    ('smiles_raw', "smiles_raw = ?", 'raw SMILES'),
+    ('common_name', "common_name = ? COLLATE NOCASE", 'common name'),
+)
+
+# All checks run as one statement; pri is the index into DUP_CHECKS of the match
+DUPLICATE_CHECK_SQL = "\nUNION ALL\n".join(
+    f"SELECT compound_id, {pri} AS pri FROM compounds WHERE {condition}"
+    for pri, (_, condition, _) in enumerate(DUP_CHECKS)
+) + "\nORDER BY pri LIMIT 1"
+
+INSERT_COMPOUND_SQL = """
+INSERT INTO compounds (
+    iupac_name, common_name, smiles_raw, smiles_normalized, inchi, inchi_key,
+    molecular_formula, molecular_weight, fingerprint, structure_2d_svg, metadata
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# The unique indexes in schema.sql cover every DUP_CHECKS column, so a
+# duplicate is simply not inserted; RETURNING then yields no row.
+INSERT_COMPOUND_RETURNING_SQL = INSERT_COMPOUND_SQL + "ON CONFLICT DO NOTHING RETURNING compound_id\n"
+
+EXISTING_INCHI_KEYS_SQL = "SELECT inchi_key FROM compounds WHERE inchi_key IS NOT NULL"
+
+# LIKE is already case-insensitive for ASCII, so no LOWER() per row and column
+SEARCH_COMPOUNDS_SQL = """
+SELECT compound_id, iupac_name, common_name, smiles_normalized, molecular_formula
+FROM compounds
+WHERE iupac_name LIKE :q
+  OR common_name LIKE :q
+  OR smiles_normalized LIKE :q
+  OR smiles_raw LIKE :q
+  OR inchi_key LIKE :q
+  OR molecular_formula LIKE :q
+ORDER BY common_name COLLATE NOCASE ASC, iupac_name COLLATE NOCASE ASC
+"""
+
+# The trigram index cannot match fewer than three characters, so shorter
+# queries still go through SEARCH_COMPOUNDS_SQL.
+FTS_MIN_QUERY_LENGTH = 3
+FTS_SEARCH_COMPOUNDS_SQL = """
+SELECT c.compound_id, c.iupac_name, c.common_name, c.smiles_normalized, c.molecular_formula
+FROM compounds_fts f
+JOIN compounds c ON c.compound_id = f.rowid
+WHERE compounds_fts MATCH ?
+ORDER BY c.common_name COLLATE NOCASE ASC, c.iupac_name COLLATE NOCASE ASC
+"""
+
+# Keyset pagination for /search. Pages are ordered by the same expressions
+# as idx_compounds_name_sort (NULL names sort as ''), with compound_id as the
+# tie-breaker, so each page is a seek into the index followed by a short walk.
+SEARCH_PAGE_SIZE = 100
+FIRST_PAGE_SQL = """
+SELECT compound_id, iupac_name, common_name, smiles_normalized, molecular_formula
+FROM compounds
+ORDER BY IFNULL(common_name, '') COLLATE NOCASE, IFNULL(iupac_name, '') COLLATE NOCASE, compound_id
+LIMIT ?
+"""
+PAGE_SORT_KEY_SQL = """
+SELECT IFNULL(common_name, ''), IFNULL(iupac_name, ''), compound_id
+FROM compounds WHERE compound_id = ?
+"""
+# The separate >= ?1 term is what lets SQLite seek instead of scanning the index
+NEXT_PAGE_SQL = """
+SELECT compound_id, iupac_name, common_name, smiles_normalized, molecular_formula
+FROM compounds
+WHERE IFNULL(common_name, '') COLLATE NOCASE >= ?1
+  AND (IFNULL(common_name, '') COLLATE NOCASE, IFNULL(iupac_name, '') COLLATE NOCASE, compound_id) > (?1, ?2, ?3)
+ORDER BY IFNULL(common_name, '') COLLATE NOCASE, IFNULL(iupac_name, '') COLLATE NOCASE, compound_id
+LIMIT ?4
+"""
+
+def _json_array_sql(select_sql):
+    """Wraps a compound listing query so SQLite returns the rows as one JSON array."""
+    return f"""
+    SELECT json_group_array(json_object(
+        'compound_id', compound_id,
+        'iupac_name', iupac_name,
+        'common_name', common_name,
+        'smiles_normalized', smiles_normalized,
+        'molecular_formula', molecular_formula
+    )) FROM ({select_sql})
+    """
+
+# search_api hands these straight to the client without building Python dicts
+FIRST_PAGE_JSON_SQL = _json_array_sql(FIRST_PAGE_SQL)
+NEXT_PAGE_JSON_SQL = _json_array_sql(NEXT_PAGE_SQL)
+SEARCH_COMPOUNDS_JSON_SQL = _json_array_sql(SEARCH_COMPOUNDS_SQL)
+FTS_SEARCH_COMPOUNDS_JSON_SQL = _json_array_sql(FTS_SEARCH_COMPOUNDS_SQL)
+
+INSERT_UPLOAD_JOB_SQL = "INSERT INTO upload_jobs (identifier) VALUES (?)"
+UPLOAD_JOB_SQL = "SELECT job_id, identifier, status, compound_id, messages FROM upload_jobs WHERE job_id = ?"
+UPDATE_UPLOAD_JOB_SQL = """
+UPDATE upload_jobs SET status = ?, compound_id = ?, messages = ?, updated_at = CURRENT_TIMESTAMP
+WHERE job_id = ?
+"""
+# Messages are flashed once; later visits to the job just redirect
+DELIVER_UPLOAD_JOB_MESSAGES_SQL = "UPDATE upload_jobs SET messages = NULL WHERE job_id = ? AND messages IS NOT NULL"
+# A job whose worker could not record its result (e.g. no database connection)
+# would otherwise stay unfinished and keep the status page polling forever
+UPLOAD_JOB_TIMEOUT = 300 # seconds
+EXPIRE_UPLOAD_JOB_SQL = """
+UPDATE upload_jobs SET status = 'failed', updated_at = CURRENT_TIMESTAMP,
+    messages = '[["danger", "The upload did not finish in time. Please try again."]]'
+WHERE job_id = ? AND status IN ('pending', 'running') AND updated_at < datetime('now', ?)
+"""
+
+# Jobs that were queued or running when the server stopped will never finish
+ABANDON_UPLOAD_JOBS_SQL = """
+UPDATE upload_jobs SET status = 'failed', updated_at = CURRENT_TIMESTAMP,
+    messages = '[["danger", "The upload was interrupted by a server restart. Please try again."]]'
+WHERE status IN ('pending', 'running')
+"""
+
+LEGACY_FINGERPRINTS_SQL = "SELECT compound_id, fingerprint FROM compounds WHERE typeof(fingerprint) = 'text'"
+LEGACY_SVGS_SQL = "SELECT compound_id, structure_2d_svg FROM compounds WHERE typeof(structure_2d_svg) = 'text'"
+
+# Values that would violate the UNIQUE indexes at the end of schema.sql
+UNIQUE_CONFLICTS_SQL = """
+SELECT 'normalized SMILES', smiles_normalized, group_concat(compound_id, ', ') FROM compounds
+WHERE smiles_normalized IS NOT NULL GROUP BY smiles_normalized HAVING COUNT(*) > 1
+UNION ALL
+SELECT 'raw SMILES', smiles_raw, group_concat(compound_id, ', ') FROM compounds
+WHERE smiles_raw IS NOT NULL GROUP BY smiles_raw HAVING COUNT(*) > 1
+UNION ALL
+SELECT 'common name', MIN(common_name), group_concat(compound_id, ', ') FROM compounds
+WHERE common_name IS NOT NULL GROUP BY common_name COLLATE NOCASE HAVING COUNT(*) > 1
+"""
+
+# Only the columns compound.html uses; the fingerprint is never needed there
+COMPOUND_DETAILS_SQL = """
+SELECT compound_id, iupac_name, common_name, smiles_raw, smiles_normalized, inchi, inchi_key,
+       molecular_formula, molecular_weight, svg_text(structure_2d_svg) AS structure_2d_svg, metadata
+FROM compounds WHERE compound_id = ?
+"""
+
+def init_db():
+    """Switches the database to WAL, applies schema.sql so newly added indexes are created, and migrates old rows.
+
+    Returns False if the schema could not be applied, in which case the app should not start.
+    """
+    try:
+        conn = sqlite3.connect(DATABASE_URI, uri=True)
+    except sqlite3.Error as e:
+        logger.error("Database connection error: %s", e)
+        return False
+
+    try:
+        # WAL lets searches keep reading while an upload commits. Unlike the
+        # other PRAGMAs (see _connect) it is stored in the database file.
+        conn.execute("PRAGMA journal_mode=WAL")
+        fts_exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'compounds_fts'"
+        ).fetchone()
+        compounds_exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'compounds'"
+        ).fetchone()
+        # Rows added before the duplicate-check indexes became UNIQUE can make
+        # schema.sql fail; report them rather than serve a half-migrated database
+        conflicts = conn.execute(UNIQUE_CONFLICTS_SQL).fetchall() if compounds_exists else []
+        for label, value, compound_ids in conflicts:
+            logger.error("Compounds %s share the %s %r", compound_ids, label, value)
+        if conflicts:
+            logger.error("Remove or merge the duplicate compounds above, then restart")
+            return False
+        with open(SCHEMA_PATH, 'r') as f:
+            conn.executescript(f.read())
+        # The triggers only index new writes; backfill rows that predate the table
+        if not fts_exists:
+            conn.execute("INSERT INTO compounds_fts(compounds_fts) VALUES ('rebuild')")
+        # Rows written before fingerprints became binary still hold '0'/'1' strings
+        legacy = conn.execute(LEGACY_FINGERPRINTS_SQL).fetchall()
+        conn.executemany(
+            "UPDATE compounds SET fingerprint = ? WHERE compound_id = ?",
+            [(fingerprint_from_bitstring(bits), compound_id) for compound_id, bits in legacy],
+        )
+        # ...and uncompressed SVG markup
+        legacy = conn.execute(LEGACY_SVGS_SQL).fetchall()
+        conn.executemany(
+            "UPDATE compounds SET structure_2d_svg = ? WHERE compound_id = ?",
+            [(compress_svg(svg), compound_id) for compound_id, svg in legacy],
+        )
+        conn.execute(ABANDON_UPLOAD_JOBS_SQL)
+        conn.commit()
+        return True
+    except (sqlite3.Error, FileNotFoundError) as e:
+        logger.error("Error applying schema from %s: %s", SCHEMA_PATH, e)
+        return False
+    finally:
+        conn.close()
+
+# --- Connection Pool ---
+# Each request checks a connection out of the pool on first use (kept on
+# flask.g) and hands it back on teardown, so the database file is opened once
+# per pooled connection rather than once per request.
+POOL_SIZE = 8
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",  # durable in WAL mode, without an fsync per commit
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256 MB
+    "PRAGMA cache_size=-20000",  # ~20 MB
+)
+_connection_pool = queue.LifoQueue(maxsize=POOL_SIZE)
+
+def _connect():
+    # Connections move between request threads, hence check_same_thread=False;
+    # each one is only ever used by the request that checked it out.
+    # isolation_level=None: transactions are opened explicitly (BEGIN IMMEDIATE)
+    # by the routes that write, and plain reads never hold one open.
+    # cached_statements=128: Python before 3.11 defaults to 100 prepared statements
+    conn = sqlite3.connect(DATABASE_URI, uri=True, check_same_thread=False, cached_statements=128, isolation_level=None)
+    # This allows accessing columns by name
+    conn.row_factory = sqlite3.Row
+    # Per-connection tuning; pooled connections only pay for this once
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    # Lets COMPOUND_DETAILS_SQL inflate the stored SVG blob in the query itself
+    conn.create_function("svg_text", 1, decompress_svg, deterministic=True)
+    return conn
 
 def get_db_connection():
+    if 'db' not in g:
+        try:
+            g.db = _connection_pool.get_nowait()
+        except queue.Empty:
+            try:
+                g.db = _connect()
+            except sqlite3.Error as e:
+                logger.error("Database connection error: %s", e)
+                # Upload jobs run outside of a request and have nowhere to flash to
+                if has_request_context():
+                    flash(f"Database connection error: {e}", "danger")
+                return None
+    return g.db
+
+@app.teardown_appcontext
+def release_db_connection(exception):
+    conn = g.pop('db', None)
+    if conn is None:
+        return
+    # Never hand a half-finished transaction to the next request
+    if conn.in_transaction:
+        conn.rollback()
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        # This allows accessing columns by name
-        conn.row_factory = sqlite3.Row
-        return conn
-    except sqlite3.Error as e:
-        flash(f"Database connection error: {e}", "danger")
-        return None
+        _connection_pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
+# Runs upload jobs off the request threads
+UPLOAD_WORKERS = 8
+upload_executor = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS)
+# Bulk upload fetches get their own pool so a large file cannot hold up the
+# single uploads queued on upload_executor
+bulk_executor = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS)
+
+def _compound_row(data):
+    """Builds the INSERT_COMPOUND_SQL parameters from a get_compound_data() result."""
+    # Empty duplicate-check values are stored as NULL so the partial unique
+    # indexes ignore them, matching DUPLICATE_CHECK_SQL
+    return (
+        data.get('iupac_name'),
+        data.get('common_name') or None,
+        data.get('smiles_raw') or None, # Use .get() as it might be missing if only sources found
+        data.get('smiles_normalized') or None,
+        data.get('inchi'),
+        data.get('inchi_key') or None,
+        data.get('molecular_formula'),
+        data.get('molecular_weight'),
+        data.get('fingerprint'),
+        compress_svg(data.get('structure_2d_svg')),
+        orjson.dumps(data.get('sources', [])).decode()
+    )
 
 # --- Routes ---
 
 @app.route('/')
+@cache.cached(timeout=60, key_prefix=INDEX_CACHE_KEY, unless=_has_pending_flashes, response_filter=_is_rendered_page)
 def index():
-    
     conn = get_db_connection()
     if not conn:
+        _skip_page_cache()
         return render_template('index.html', count=0, error="Database connection failed.")
 
     count = 0
     try:
         cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM compounds")
+        cursor.execute(COUNT_COMPOUNDS_SQL)
         # fetchone() for sqlite returns a tuple, access by index
         result = cursor.fetchone()
         if result:
             count = result[0]
     except sqlite3.Error as err:
         flash(f"Error fetching data: {err}")
+        _skip_page_cache()
         count = 0
-    finally:
-        if conn:
-            conn.close()
 
     return render_template('index.html', count=count)
 
+def _process_upload(identifier):
+    """Fetches, de-duplicates and stores one compound.
+
+    Returns (status, compound_id, messages) for the upload job, where messages
+    is a list of [category, message] pairs to flash once the user checks back.
+    """
+    messages = []
+
+    # Process the identifier (this now handles names, SMILES, etc.)
+    try:
+        data = get_compound_data(identifier)
+    except Exception as e:
+        logger.debug("Exception in get_compound_data: %s", e)
+        return 'failed', None, [['danger', f"Error processing compound data: {e}"]]
+
+    if 'error' in data and not data.get('smiles_raw'):
+        if data.get('sources'):
+            messages.append(['info', f"Could not fully process compound: {data['error']}. However, external links were found and saved."])
+        else:
+            logger.debug("Error processing identifier: %s", data['error'])
+            return 'failed', None, [['danger', f"Error processing identifier: {data['error']}"]]
+
+    # If no smiles_raw is present, we cannot proceed with full compound data, but we might have sources.
+    if not data.get('smiles_raw') and not data.get('sources'):
+        logger.debug("No SMILES or sources found for '%s'", identifier)
+        return 'failed', None, [['danger', f"Could not process '{identifier}' and no external sources were found."]]
+
+    conn = get_db_connection()
+    if not conn:
+        return 'failed', None, [['danger', "Database connection failed."]]
+
+    try:
+        cursor = conn.cursor()
+        # The unique indexes make the insert its own duplicate check, so the
+        # happy path is a single statement and needs no explicit transaction
+        cursor.execute(INSERT_COMPOUND_RETURNING_SQL, _compound_row(data))
+        inserted = cursor.fetchone()
+        if not inserted:
+            # Find the compound it clashed with, in DUP_CHECKS order of precedence
+            cursor.execute(DUPLICATE_CHECK_SQL, tuple(data.get(key) or None for key, _, _ in DUP_CHECKS))
+            existing_compound = cursor.fetchone()
+            if not existing_compound:
+                return 'failed', None, [['danger', "Compound could not be added; it conflicts with an existing entry."]]
+            match = DUP_CHECKS[existing_compound['pri']][2]
+            messages.append(['info', f"This compound ({match} match) already exists in the database (ID: {existing_compound['compound_id']})."])
+            return 'done', existing_compound['compound_id'], messages
+        new_id = inserted['compound_id']
+        cache.delete(INDEX_CACHE_KEY)
+    except sqlite3.Error as err:
+        return 'failed', None, [['danger', f"Database error: {err}"]]
+
+    messages.append(['success', "Compound added successfully!"])
+    return 'done', new_id, messages
+
+def _record_upload_job(job_id, status, compound_id=None, messages=None):
+    conn = get_db_connection()
+    if not conn:
+        # upload_status expires the job after UPLOAD_JOB_TIMEOUT
+        logger.error("Could not record status %s of upload job %s: no database connection", status, job_id)
+        return
+    try:
+        conn.execute(UPDATE_UPLOAD_JOB_SQL, (status, compound_id, messages, job_id))
+    except sqlite3.Error as err:
+        logger.error("Could not record status %s of upload job %s: %s", status, job_id, err)
+
+def run_upload_job(job_id, identifier):
+    """Executor task: processes an upload and records the outcome on its job row."""
+    # The pooled connection lives on flask.g, so the job needs an app context of
+    # its own. Marking the job running gets a separate one, so the connection
+    # goes back to the pool for the network fetch; _process_upload only takes
+    # one once get_compound_data has returned.
+    with app.app_context():
+        _record_upload_job(job_id, 'running')
+    with app.app_context():
+        try:
+            status, compound_id, messages = _process_upload(identifier)
+        except Exception as e:
+            logger.exception("Upload job %s failed", job_id)
+            status, compound_id, messages = 'failed', None, [['danger', f"Error processing compound data: {e}"]]
+        _record_upload_job(job_id, status, compound_id, orjson.dumps(messages).decode())
+
 @app.route('/upload', methods=['GET', 'POST'])
 def upload():
     if request.method == 'POST':
@@ -59,131 +448,177 @@ def upload():
             flash("Compound identifier is required.", "warning")
             return render_template('upload.html')
 
-        # Process the identifier (this now handles names, SMILES, etc.)
-        try:
-            data = get_compound_data(identifier)
-        except Exception as e:
-            flash(f"Error processing compound data: {e}", "danger")
-            print(f"DEBUG: Exception in get_compound_data: {e}")
-            return render_template('upload.html')
-
-        if 'error' in data and not data.get('smiles_raw'):
-            if data.get('sources'):
-                flash(f"Could not fully process compound: {data['error']}. However, external links were found and saved.", "info")
-            else:
-                flash(f"Error processing identifier: {data['error']}", "danger")
-                print(f"DEBUG: Error processing identifier: {data['error']}")
-                return render_template('upload.html')
-
-        # If no smiles_raw is present, we cannot proceed with full compound data, but we might have sources.
-        if not data.get('smiles_raw') and not data.get('sources'):
-            flash(f"Could not process '{identifier}' and no external sources were found.", "danger")
-            print(f"DEBUG: No SMILES or sources found for '{identifier}'")
-            return render_template('upload.html')
-
         conn = get_db_connection()
         if not conn:
             flash("Database connection failed.", "danger")
             return render_template('upload.html')
 
+        # Fetching from PubChem/ChEMBL/UniChem takes seconds, so the request only
+        # records a job and answers 202; the work happens on upload_executor.
         try:
             cursor = conn.cursor()
-            existing_compound = None
-
-            # 1. Check for duplicates using InChIKey (most reliable)
-            if data.get('inchi_key'):
-                cursor.execute("SELECT compound_id FROM compounds WHERE inchi_key = ?", (data['inchi_key'],))
-                existing_compound = cursor.fetchone()
-                if existing_compound:
-                    flash(f"This compound (InChIKey match) already exists in the database (ID: {existing_compound['compound_id']}).", "info")
-                    return redirect(url_for('compound_details', compound_id=existing_compound['compound_id']))
-
-            # 2. If no InChIKey match, check for duplicates using smiles_normalized
-            if not existing_compound and data.get('smiles_normalized'):
-                cursor.execute("SELECT compound_id FROM compounds WHERE smiles_normalized = ?", (data['smiles_normalized'],))
-                existing_compound = cursor.fetchone()
-                if existing_compound:
-                    flash(f"This compound (normalized SMILES match) already exists in the database (ID: {existing_compound['compound_id']}).", "info")
-                    return redirect(url_for('compound_details', compound_id=existing_compound['compound_id']))
-
-            # 3. If no normalized SMILES match, check for duplicates using smiles_raw
-            if not existing_compound and data.get('smiles_raw'):
-                cursor.execute("SELECT compound_id FROM compounds WHERE smiles_raw = ?", (data['smiles_raw'],))
-                existing_compound = cursor.fetchone()
-                if existing_compound:
-                    flash(f"This compound (raw SMILES match) already exists in the database (ID: {existing_compound['compound_id']}).", "info")
-                    return redirect(url_for('compound_details', compound_id=existing_compound['compound_id']))
-
-            # 4. If no other match, check for duplicates using common_name
-            if not existing_compound and data.get('common_name'):
-                cursor.execute("SELECT compound_id FROM compounds WHERE common_name = ? COLLATE NOCASE", (data['common_name'],))
-                existing_compound = cursor.fetchone()
-                if existing_compound:
-                    flash(f"This compound (common name match) already exists in the database (ID: {existing_compound['compound_id']}).", "info")
-                    return redirect(url_for('compound_details', compound_id=existing_compound['compound_id']))
-
-            # Prepare the SQL INSERT statement
-            sql = """
-            INSERT INTO compounds (
-                iupac_name, common_name, smiles_raw, smiles_normalized, inchi, inchi_key,
-                molecular_formula, molecular_weight, fingerprint, structure_2d_svg, metadata
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            val = (
-                data.get('iupac_name'),
-                data.get('common_name'),
-                data.get('smiles_raw'), # Use .get() as it might be missing if only sources found
-                data.get('smiles_normalized'), # Use .get() as it might be missing
-                data.get('inchi'), # Use .get() as it might be missing
-                data.get('inchi_key'), # Use .get() as it might be missing
-                data.get('molecular_formula'), # Use .get() as it might be missing
-                data.get('molecular_weight'), # Use .get() as it might be missing
-                data.get('fingerprint'), # Use .get() as it might be missing
-                data.get('structure_2d_svg'), # Use .get() as it might be missing
-                json.dumps(data.get('sources', []))
-            )
-            cursor.execute(sql, val)
-            conn.commit()
-            flash("Compound added successfully!", "success")
+            cursor.execute(INSERT_UPLOAD_JOB_SQL, (identifier,))
+            job_id = cursor.lastrowid
+            cursor.execute(UPLOAD_JOB_SQL, (job_id,))
+            job = cursor.fetchone()
         except sqlite3.Error as err:
             flash(f"Database error: {err}", "danger")
-        finally:
-            if conn:
-                conn.close()
-
-        # If a compound was added, redirect to its details page if possible
-        if data.get('inchi_key'):
-            conn = get_db_connection()
-            if conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT compound_id FROM compounds WHERE inchi_key = ?", (data['inchi_key'],))
-                new_compound = cursor.fetchone()
-                if new_compound:
-                    return redirect(url_for('compound_details', compound_id=new_compound['compound_id']))
-            flash("Compound added, but could not retrieve details page.", "info")
-        return redirect(url_for('index'))
+            return render_template('upload.html')
+
+        upload_executor.submit(run_upload_job, job_id, identifier)
+        return render_template('upload_status.html', job=job), 202
 
     return render_template('upload.html')
 
+@app.route('/upload/jobs/<int:job_id>')
+def upload_status(job_id):
+    conn = get_db_connection()
+    if not conn:
+        return redirect(url_for('upload'))
+
+    try:
+        cursor = conn.cursor()
+        cursor.execute(UPLOAD_JOB_SQL, (job_id,))
+        job = cursor.fetchone()
+        if job and job['status'] in ('pending', 'running'):
+            cursor.execute(EXPIRE_UPLOAD_JOB_SQL, (job_id, f"-{UPLOAD_JOB_TIMEOUT} seconds"))
+            if cursor.rowcount:
+                cursor.execute(UPLOAD_JOB_SQL, (job_id,))
+                job = cursor.fetchone()
+    except sqlite3.Error as err:
+        flash(f"Error fetching upload status: {err}", "danger")
+        return redirect(url_for('upload'))
+
+    if not job:
+        flash("Upload job not found.", "warning")
+        return redirect(url_for('upload'))
+
+    if job['status'] in ('pending', 'running'):
+        return render_template('upload_status.html', job=job)
+
+    if job['messages']:
+        try:
+            cursor.execute(DELIVER_UPLOAD_JOB_MESSAGES_SQL, (job_id,))
+            # Another visit may have delivered them in the meantime
+            delivered = cursor.rowcount
+        except sqlite3.Error as err:
+            logger.error("Could not mark the messages of upload job %s as delivered: %s", job_id, err)
+            delivered = True
+        if delivered:
+            for category, message in orjson.loads(job['messages']):
+                flash(message, category)
+    if job['compound_id'] is not None:
+        return redirect(url_for('compound_details', compound_id=job['compound_id']))
+    return redirect(url_for('upload'))
+
+def _fetch_compound_data(identifier):
+    try:
+        return get_compound_data(identifier)
+    except Exception as e:
+        return {"error": str(e)}
+
+@app.route('/upload_bulk', methods=['POST'])
+def upload_bulk():
+    # Identifiers arrive either as a JSON array or as a text file with one per line
+    if request.is_json:
+        identifiers = request.get_json(silent=True)
+        if not isinstance(identifiers, list) or not all(isinstance(i, str) for i in identifiers):
+            return jsonify(error="Expected a JSON array of identifier strings."), 400
+    else:
+        upload_file = request.files.get('file')
+        if not upload_file:
+            flash("A file of compound identifiers is required.", "warning")
+            return redirect(url_for('upload'))
+        identifiers = upload_file.read().decode('utf-8', errors='replace').splitlines()
+
+    # Drop blanks and repeats while keeping the submitted order
+    identifiers = list(dict.fromkeys(i.strip() for i in identifiers if i.strip()))
+
+    # get_compound_data is dominated by waiting on PubChem/ChEMBL/UniChem
+    results = list(bulk_executor.map(_fetch_compound_data, identifiers))
+
+    conn = get_db_connection()
+    if not conn:
+        if request.is_json:
+            return jsonify(error="Database connection failed."), 500
+        flash("Database connection failed.", "danger")
+        return redirect(url_for('upload'))
+
+    rows = [] # (identifier, row) pairs to insert
+    skipped = []
+    failed = []
+    inserted = 0
+    try:
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        # One query for every known key instead of a duplicate check per row
+        cursor.execute(EXISTING_INCHI_KEYS_SQL)
+        seen_keys = {row['inchi_key'] for row in cursor.fetchall()}
+
+        for identifier, data in zip(identifiers, results):
+            inchi_key = data.get('inchi_key')
+            if not inchi_key:
+                failed.append({'identifier': identifier, 'error': data.get('error', 'No InChIKey found')})
+            elif inchi_key in seen_keys:
+                skipped.append(identifier)
+            else:
+                seen_keys.add(inchi_key)
+                rows.append((identifier, _compound_row(data)))
+
+        # Still one transaction; RETURNING tells which rows the unique
+        # indexes rejected (same SMILES or name as a stored compound)
+        for identifier, row in rows:
+            cursor.execute(INSERT_COMPOUND_RETURNING_SQL, row)
+            if cursor.fetchone():
+                inserted += 1
+            else:
+                skipped.append(identifier)
+        cursor.execute("COMMIT")
+        if inserted:
+            cache.delete(INDEX_CACHE_KEY)
+    except sqlite3.Error as err:
+        if conn.in_transaction:
+            cursor.execute("ROLLBACK")
+        if request.is_json:
+            return jsonify(error=f"Database error: {err}"), 500
+        flash(f"Database error: {err}", "danger")
+        return redirect(url_for('upload'))
+
+    if request.is_json:
+        return jsonify(inserted=inserted, skipped=skipped, failed=failed)
+
+    flash(f"Bulk upload finished: {inserted} added, {len(skipped)} already in the database, {len(failed)} could not be processed.", "success" if inserted else "info")
+    for failure in failed:
+        flash(f"Could not process '{failure['identifier']}': {failure['error']}", "warning")
+    return redirect(url_for('upload'))
+
 @app.route('/search')
 def search():
     conn = get_db_connection()
     if not conn:
         flash("Database connection failed.")
-        return render_template('search.html', compounds=[])
+        return render_template('search.html', compounds=[], next_after=None)
 
+    # ?after=<compound_id> continues the listing after that compound
+    after = request.args.get('after', type=int)
     compounds = []
     try:
         cursor = conn.cursor()
-        cursor.execute("SELECT compound_id, iupac_name, common_name, smiles_normalized, molecular_formula FROM compounds ORDER BY common_name COLLATE NOCASE ASC, iupac_name COLLATE NOCASE ASC")
+        sort_key = None
+        if after is not None:
+            cursor.execute(PAGE_SORT_KEY_SQL, (after,))
+            sort_key = cursor.fetchone()
+        if sort_key:
+            cursor.execute(NEXT_PAGE_SQL, (*sort_key, SEARCH_PAGE_SIZE))
+        else:
+            cursor.execute(FIRST_PAGE_SQL, (SEARCH_PAGE_SIZE,))
         compounds = cursor.fetchall()
     except sqlite3.Error as err:
         flash(f"Error fetching compounds: {err}")
-    finally:
-        if conn:
-            conn.close()
 
-    return render_template('search.html', compounds=compounds)
+    # A full page means there may be more; the last row is the next cursor
+    next_after = compounds[-1]['compound_id'] if len(compounds) == SEARCH_PAGE_SIZE else None
+    return render_template('search.html', compounds=compounds, next_after=next_after)
 
 @app.route('/search_api')
 def search_api():
@@ -192,81 +627,87 @@ def search_api():
     if not conn:
         return jsonify(error="Database connection failed."), 500
 
-    results = []
+    results = '[]'
     try:
         cursor = conn.cursor()
-        if query:
-            like_query = f"%{query.lower()}%"
-            sql = """
-            SELECT compound_id, iupac_name, common_name, smiles_normalized, molecular_formula
-            FROM compounds
-            WHERE LOWER(iupac_name) LIKE ?
-              OR LOWER(common_name) LIKE ?
-              OR smiles_normalized LIKE ?
-              OR smiles_raw LIKE ?
-              OR inchi_key LIKE ?
-              OR molecular_formula LIKE ?
-            ORDER BY common_name COLLATE NOCASE ASC, iupac_name COLLATE NOCASE ASC
-            """
-            cursor.execute(sql, (like_query, like_query, like_query, like_query, like_query, like_query))
+        if len(query) >= FTS_MIN_QUERY_LENGTH:
+            # Quote the query as a single FTS5 string so SMILES/InChIKey
+            # punctuation is matched literally instead of parsed as syntax
+            fts_query = '"' + query.replace('"', '""') + '"'
+            cursor.execute(FTS_SEARCH_COMPOUNDS_JSON_SQL, (fts_query,))
+        elif query:
+            cursor.execute(SEARCH_COMPOUNDS_JSON_SQL, {'q': f"%{query}%"})
         else:
-            cursor.execute("SELECT compound_id, iupac_name, common_name, smiles_normalized, molecular_formula FROM compounds ORDER BY common_name COLLATE NOCASE ASC, iupac_name COLLATE NOCASE ASC")
-        
-        results = [dict(row) for row in cursor.fetchall()]
+            # Without a query this is the same paged listing as /search
+            after = request.args.get('after', type=int)
+            sort_key = None
+            if after is not None:
+                cursor.execute(PAGE_SORT_KEY_SQL, (after,))
+                sort_key = cursor.fetchone()
+            if sort_key:
+                cursor.execute(NEXT_PAGE_JSON_SQL, (*sort_key, SEARCH_PAGE_SIZE))
+            else:
+                cursor.execute(FIRST_PAGE_JSON_SQL, (SEARCH_PAGE_SIZE,))
+
+        # A single row holding the already-serialized JSON array
+        results = cursor.fetchone()[0]
 
     except sqlite3.Error as err:
         return jsonify(error=f"Search error: {err}"), 500
-    finally:
-        if conn:
-            conn.close()
 
-    return jsonify(results)
+    return Response(results, mimetype='application/json')
 
 @app.route('/compound/<int:compound_id>')
+@cache.cached(timeout=3600, unless=_has_pending_flashes, response_filter=_is_rendered_page)
 def compound_details(compound_id):
-    print(f"DEBUG: Entering compound_details route for compound_id: {compound_id}")
+    logger.debug("Entering compound_details route for compound_id: %s", compound_id)
     conn = get_db_connection()
     if not conn:
-        print("DEBUG: Database connection failed in compound_details.")
+        logger.debug("Database connection failed in compound_details.")
         return redirect(url_for('index'))
 
     compound = None
     sources = []
     try:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM compounds WHERE compound_id = ?", (compound_id,))
+        cursor.execute(COMPOUND_DETAILS_SQL, (compound_id,))
         compound = cursor.fetchone()
         if not compound:
             flash("Compound not found.")
-            print(f"DEBUG: Compound with ID {compound_id} not found in database.")
+            logger.debug("Compound with ID %s not found in database.", compound_id)
             return redirect(url_for('index'))
-        
-        # Convert sqlite3.Row to a dictionary for easier JSON serialization
-        compound_dict = dict(compound)
 
-        if compound_dict['metadata']:
+        # sqlite3.Row supports key lookup, which is all Jinja needs, so the
+        # row is passed to the template as-is
+        if compound['metadata']:
             try:
-                sources = json.loads(compound_dict['metadata'])
-                print(f"DEBUG: Successfully parsed metadata for compound {compound_id}.")
-            except json.JSONDecodeError as e:
+                sources = orjson.loads(compound['metadata'])
+                logger.debug("Successfully parsed metadata for compound %s.", compound_id)
+            except orjson.JSONDecodeError as e:
                 flash("Error parsing metadata for compound.", "warning")
-                print(f"DEBUG: Error parsing metadata for compound {compound_id}: {e}")
+                _skip_page_cache()
+                logger.debug("Error parsing metadata for compound %s: %s", compound_id, e)
 
     except sqlite3.Error as err:
         flash(f"Error fetching compound details: {err}")
-        print(f"DEBUG: SQLite error fetching compound details for {compound_id}: {err}")
+        logger.debug("SQLite error fetching compound details for %s: %s", compound_id, err)
         return redirect(url_for('index'))
-    finally:
-        if conn:
-            conn.close()
 
-    print(f"DEBUG: Rendering compound.html for compound {compound_id}. Compound data: {compound_dict}")
-    return render_template('compound.html', compound=compound_dict, sources=sources)
+    # Log the id only; the row carries the full SVG
+    logger.debug("Rendering compound.html for compound %s.", compound_id)
+    return render_template('compound.html', compound=compound, sources=sources)
 
 @app.route('/about')
+@cache.cached(timeout=3600, unless=_has_pending_flashes, response_filter=_is_rendered_page)
 def about():
     return render_template('about.html')
 
+# Runs when the app is created rather than under __main__, so WSGI launches
+# (flask run, gunicorn) migrate the database too. Every statement in
+# schema.sql is idempotent, so this is safe on each start.
+if not init_db():
+    raise RuntimeError("Database initialisation failed; see the log above.")
+
 if __name__ == '__main__':
     # Use 0.0.0.0 to make it accessible from the network
     app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
@@ -1,257 +1,546 @@
 import argparse
-import requests
+import asyncio
+import atexit
+import threading
+import httpx
+import hishel
+from aiolimiter import AsyncLimiter
 import urllib.parse
 import re
-from typing import Union
-from rdkit import Chem
-from rdkit.Chem import AllChem, Draw
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Tuple, Union
+from rdkit import Chem, DataStructs
+from rdkit.Chem import Draw, rdFingerprintGenerator
 from rdkit.Chem import rdMolDescriptors
 from molvs import standardize_smiles
-import urllib3
 import json
+import orjson
 import logging
 from rdkit.Chem.Draw import MolDraw2DSVG # Import MolDraw2DSVG
 
-# Configure logging for this module
+# DEBUG output is opt-in (configure the level from the caller); log calls use
+# lazy %-formatting so disabled messages cost almost nothing on the lookup path
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
 
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+# --- HTTP Client ---
+# One pooled HTTP/2 client for every PubChem/ChEMBL/UniChem call, so concurrent
+# lookups share keep-alive connections and multiplex streams over them.
+HTTP_TIMEOUT = 15
+RETRY_STATUSES = (500, 502, 503, 504)
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.3
+
+# Successful GETs are kept on disk for 30 days regardless of the APIs' cache
+# headers, so re-running the seed or re-uploading a known name skips the network.
+HTTP_CACHE_DIR = Path(__file__).resolve().parent.parent / "http_cache"
+HTTP_CACHE_TTL = 60 * 60 * 24 * 30
+
+# PubChem asks clients to stay under 5 requests per second. The limit is
+# applied below the cache, so only requests that reach the network take a token.
+PUBCHEM_HOST = "pubchem.ncbi.nlm.nih.gov"
+PUBCHEM_MAX_RATE = 5
+
+class _PubChemRateLimit(httpx.AsyncBaseTransport):
+    """Wraps a transport, holding requests to PubChem to PUBCHEM_MAX_RATE per second."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+        self._limiter = AsyncLimiter(PUBCHEM_MAX_RATE, 1)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.host == PUBCHEM_HOST:
+            await self._limiter.acquire()
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+# Created on first use rather than at import, so processes that only run the
+# CPU stage (seed.py's worker pool) never build one. Helpers must go through
+# _client(); a client per call would throw away pooled connections.
+_CLIENT: Union[httpx.AsyncClient, None] = None
+
+def _client() -> httpx.AsyncClient:
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT,
+            transport=hishel.AsyncCacheTransport(
+                transport=_PubChemRateLimit(httpx.AsyncHTTPTransport(
+                    http2=True,
+                    verify=False,
+                    retries=MAX_RETRIES,  # connection errors only; status retries happen in _get
+                    limits=httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=60.0),
+                )),
+                storage=hishel.AsyncFileStorage(base_path=HTTP_CACHE_DIR, ttl=HTTP_CACHE_TTL),
+                controller=hishel.Controller(cacheable_methods=["GET"], cacheable_status_codes=[200], force_cache=True),
+            ),
+        )
+    return _CLIENT
+
+# The client's connections belong to the event loop that opened them, so all
+# lookups run on one long-lived loop in a background thread. Synchronous
+# callers hand their coroutines to it through run_sync().
+_loop: Union[asyncio.AbstractEventLoop, None] = None
+_loop_lock = threading.Lock()
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="normalize-compound-io", daemon=True).start()
+    return _loop
+
+def run_sync(coro):
+    """Run a coroutine on the shared lookup loop and block until it finishes."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+@atexit.register
+def _close_client() -> None:
+    # The client has to be closed on the loop that owns its connections
+    if _CLIENT is not None and _loop is not None and _loop.is_running():
+        try:
+            asyncio.run_coroutine_threadsafe(_CLIENT.aclose(), _loop).result(timeout=HTTP_TIMEOUT)
+        except Exception as e:
+            logger.debug("Error closing HTTP client: %s", e)
+
+async def _get(url: str) -> httpx.Response:
+    """GET through the shared client, retrying transient server errors with backoff."""
+    for attempt in range(MAX_RETRIES + 1):
+        response = await _client().get(url)
+        if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            return response
+        await asyncio.sleep(RETRY_BACKOFF * (2 ** attempt))
+
+# --- API URL templates ---
+# Bound str.format methods, so each call site only fills in its identifier.
+PUBCHEM_COMPOUND_API = "https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound"
+PUBCHEM_CID_BY_NAME_URL = (PUBCHEM_COMPOUND_API + "/name/{}/cids/JSON").format
+PUBCHEM_CID_BY_INCHIKEY_URL = (PUBCHEM_COMPOUND_API + "/inchikey/{}/cids/JSON").format
+PUBCHEM_PROPERTY_URL = (PUBCHEM_COMPOUND_API + "/cid/{}/property/{}/JSON").format
+PUBCHEM_SYNONYMS_URL = (PUBCHEM_COMPOUND_API + "/cid/{}/synonyms/JSON").format
+PUBCHEM_DRUGBANK_XREFS_URL = (PUBCHEM_COMPOUND_API + "/cid/{}/xrefs/DrugBank/JSON").format
+PUBCHEM_REGISTRY_XREFS_URL = (PUBCHEM_COMPOUND_API + "/cid/{}/xrefs/RegistryID/JSON?source=DrugBank").format
+PUBCHEM_COMPOUND_PAGE_URL = "https://pubchem.ncbi.nlm.nih.gov/compound/{}".format
+UNICHEM_SOURCES_URL = "https://www.ebi.ac.uk/unichem/rest/sources"
+UNICHEM_INCHIKEY_URL = "https://www.ebi.ac.uk/unichem/rest/inchikey/{}".format
+CHEMBL_SYNONYM_SEARCH_URL = "https://www.ebi.ac.uk/chembl/api/data/molecule.json?molecule_synonyms__molecule_synonym__iexact={}".format
+CHEMBL_SEARCH_PAGE_URL = "https://www.ebi.ac.uk/chembl/g/#search_results/all/query={}".format
+DRUGBANK_DRUG_URL = "https://go.drugbank.com/drugs/{}".format
+
+def _quote(text: str) -> str:
+    """Percent-encodes a URL component; plain alphanumeric names (most antibiotics) need no work."""
+    if text.isascii() and text.isalnum():
+        return text
+    return urllib.parse.quote(text, safe="")
 
 # Simple input detectors
+# Strict form of an InChIKey, for validation; looks_like_inchikey checks the same
+# fixed-width shape with plain string operations since it runs on every identifier
 INCHIKEY_REGEX = re.compile(r"^[A-Z]{14}-[A-Z]{10}-[A-Z]$")
 
 def looks_like_inchikey(text: str) -> bool:
-    return bool(INCHIKEY_REGEX.match(text.strip()))
+    text = text.strip()
+    if len(text) != 27 or text[14] != '-' or text[25] != '-':
+        return False
+    letters = text[:14] + text[15:25] + text[26]
+    return letters.isascii() and letters.isalpha() and letters.isupper()
 
 def looks_like_pubchem_cid(text: str) -> bool:
     return text.isdigit()
 
 # --- PubChem API Functions ---
 
-def get_cid_from_pubchem(identifier: str) -> Union[str, None]:
+# Resolved CIDs are memoized per process; the long-running web app sees an
+# open-ended stream of identifiers, so the memos evict least recently used
+# entries past CID_CACHE_MAXSIZE (the same bound as the _mol cache).
+CID_CACHE_MAXSIZE = 4096
+
+def _lru_get(cache: OrderedDict, key: str) -> Union[str, None]:
+    cid = cache.get(key)
+    if cid is not None:
+        cache.move_to_end(key)
+    return cid
+
+def _lru_put(cache: OrderedDict, key: str, cid: str) -> None:
+    cache[key] = cid
+    cache.move_to_end(key)
+    if len(cache) > CID_CACHE_MAXSIZE:
+        cache.popitem(last=False)
+
+_cid_by_name_cache: OrderedDict = OrderedDict()
+
+async def get_cid_from_pubchem(identifier: str) -> Union[str, None]:
+    cid = _lru_get(_cid_by_name_cache, identifier)
+    if cid is not None:
+        return cid
     try:
-        encoded_identifier = urllib.parse.quote(identifier)
-        response = requests.get(
-            f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/name/{encoded_identifier}/cids/JSON",
-            verify=False
-        )
+        response = await _get(PUBCHEM_CID_BY_NAME_URL(_quote(identifier)))
         if response.status_code == 200:
-            data = response.json()
-            return data['IdentifierList']['CID'][0]
+            data = orjson.loads(response.content)
+            cid = data['IdentifierList']['CID'][0]
+            _lru_put(_cid_by_name_cache, identifier, cid)
+            return cid
         else:
-            logger.debug(f"PubChem CID API failed for {identifier}: {response.status_code} - {response.text}")
-    except (requests.exceptions.RequestException, KeyError) as e:
-        logger.error(f"Exception in get_cid_from_pubchem for {identifier}: {e}")
+            logger.debug("PubChem CID API failed for %s: %s - %s", identifier, response.status_code, response.text)
+    except (httpx.HTTPError, ValueError, KeyError) as e:
+        logger.error("Exception in get_cid_from_pubchem for %s: %s", identifier, e)
     return None
 
-def get_cid_from_inchikey(inchikey: str) -> Union[str, None]:
+_cid_by_inchikey_cache: OrderedDict = OrderedDict()
+
+async def get_cid_from_inchikey(inchikey: str) -> Union[str, None]:
+    cid = _lru_get(_cid_by_inchikey_cache, inchikey)
+    if cid is not None:
+        return cid
     try:
-        response = requests.get(
-            f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/inchikey/{inchikey}/cids/JSON",
-            verify=False
-        )
+        response = await _get(PUBCHEM_CID_BY_INCHIKEY_URL(inchikey))
         if response.status_code == 200:
-            data = response.json()
-            return data['IdentifierList']['CID'][0]
+            data = orjson.loads(response.content)
+            cid = data['IdentifierList']['CID'][0]
+            _lru_put(_cid_by_inchikey_cache, inchikey, cid)
+            return cid
         else:
-            logger.debug(f"PubChem CID from InChIKey API failed for {inchikey}: {response.status_code} - {response.text}")
-    except (requests.exceptions.RequestException, KeyError) as e:
-        logger.error(f"Exception in get_cid_from_inchikey for {inchikey}: {e}")
+            logger.debug("PubChem CID from InChIKey API failed for %s: %s - %s", inchikey, response.status_code, response.text)
+    except (httpx.HTTPError, ValueError, KeyError) as e:
+        logger.error("Exception in get_cid_from_inchikey for %s: %s", inchikey, e)
     return None
 
-def get_smiles_from_pubchem(cid: str) -> Union[str, None]:
+# --- PubChem batch lookups ---
+# PUG REST accepts comma-separated CID lists, so a batch caller (seed.py) can
+# fetch properties and synonyms for many compounds in a handful of requests.
+# The results are kept per CID and the single-CID helpers below read them
+# before going to the network.
+PUBCHEM_BATCH_SIZE = 100
+PUBCHEM_BATCH_PROPERTIES = "CanonicalSMILES,ConnectivitySMILES,InChIKey,IUPACName"
+
+_pubchem_properties_cache: dict = {}
+_pubchem_synonyms_cache: dict = {}
+
+async def batch_cid_properties(cids: list) -> dict:
+    """Fetches SMILES, InChIKey and IUPAC name for many CIDs; returns {cid: properties}."""
+    for start in range(0, len(cids), PUBCHEM_BATCH_SIZE):
+        chunk = ",".join(str(cid) for cid in cids[start:start + PUBCHEM_BATCH_SIZE])
+        try:
+            response = await _get(PUBCHEM_PROPERTY_URL(chunk, PUBCHEM_BATCH_PROPERTIES))
+            if response.status_code == 200:
+                for properties in orjson.loads(response.content)['PropertyTable']['Properties']:
+                    _pubchem_properties_cache[str(properties['CID'])] = properties
+            else:
+                logger.debug("PubChem batch property API failed: %s - %s", response.status_code, response.text)
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            logger.error("Exception in batch_cid_properties: %s", e)
+    return {str(cid): _pubchem_properties_cache[str(cid)] for cid in cids if str(cid) in _pubchem_properties_cache}
+
+async def batch_cid_synonyms(cids: list) -> dict:
+    """Fetches the synonym lists for many CIDs; returns {cid: synonyms}."""
+    for start in range(0, len(cids), PUBCHEM_BATCH_SIZE):
+        chunk = ",".join(str(cid) for cid in cids[start:start + PUBCHEM_BATCH_SIZE])
+        try:
+            response = await _get(PUBCHEM_SYNONYMS_URL(chunk))
+            if response.status_code == 200:
+                for information in orjson.loads(response.content)['InformationList']['Information']:
+                    _pubchem_synonyms_cache[str(information['CID'])] = information.get('Synonym', [])
+            else:
+                logger.debug("PubChem batch synonyms API failed: %s - %s", response.status_code, response.text)
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            logger.error("Exception in batch_cid_synonyms: %s", e)
+    return {str(cid): _pubchem_synonyms_cache[str(cid)] for cid in cids if str(cid) in _pubchem_synonyms_cache}
+
+def _smiles_from_properties(properties: dict) -> Union[str, None]:
+    if 'CanonicalSMILES' in properties:
+        return properties['CanonicalSMILES']
+    elif 'ConnectivitySMILES' in properties:
+        return properties['ConnectivitySMILES']
+    return None
+
+async def prefetch_pubchem_records(cids: list) -> None:
+    """Warms the per-CID caches for a batch, two requests per PUBCHEM_BATCH_SIZE CIDs."""
+    cids = list(dict.fromkeys(str(cid) for cid in cids if cid))
+    await asyncio.gather(batch_cid_properties(cids), batch_cid_synonyms(cids))
+
+async def get_smiles_from_pubchem(cid: str) -> Union[str, None]:
+    if str(cid) in _pubchem_properties_cache:
+        return _smiles_from_properties(_pubchem_properties_cache[str(cid)])
     try:
-        response = requests.get(
-            f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/cid/{cid}/property/CanonicalSMILES,ConnectivitySMILES/JSON",
-            verify=False
-        )
+        response = await _get(PUBCHEM_PROPERTY_URL(cid, "CanonicalSMILES,ConnectivitySMILES"))
         if response.status_code == 200:
-            data = response.json()
-            properties = data['PropertyTable']['Properties'][0]
-            if 'CanonicalSMILES' in properties:
-                return properties['CanonicalSMILES']
-            elif 'ConnectivitySMILES' in properties:
-                return properties['ConnectivitySMILES']
+            data = orjson.loads(response.content)
+            return _smiles_from_properties(data['PropertyTable']['Properties'][0])
         else:
-            logger.debug(f"PubChem SMILES API failed for CID {cid}: {response.status_code} - {response.text}")
-    except (requests.exceptions.RequestException, KeyError) as e:
-        logger.error(f"Exception in get_smiles_from_pubchem for CID {cid}: {e}")
+            logger.debug("PubChem SMILES API failed for CID %s: %s - %s", cid, response.status_code, response.text)
+    except (httpx.HTTPError, ValueError, KeyError) as e:
+        logger.error("Exception in get_smiles_from_pubchem for CID %s: %s", cid, e)
     return None
 
-def get_inchikey_from_pubchem(cid: str) -> Union[str, None]:
+async def get_inchikey_from_pubchem(cid: str) -> Union[str, None]:
+    if str(cid) in _pubchem_properties_cache:
+        return _pubchem_properties_cache[str(cid)].get('InChIKey')
     try:
-        response = requests.get(
-            f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/cid/{cid}/property/InChIKey/JSON",
-            verify=False
-        )
+        response = await _get(PUBCHEM_PROPERTY_URL(cid, "InChIKey"))
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             properties = data['PropertyTable']['Properties'][0]
             return properties.get('InChIKey')
         else:
-            logger.debug(f"PubChem InChIKey API failed for CID {cid}: {response.status_code} - {response.text}")
-    except (requests.exceptions.RequestException, KeyError) as e:
-        logger.error(f"Exception in get_inchikey_from_pubchem for CID {cid}: {e}")
+            logger.debug("PubChem InChIKey API failed for CID %s: %s - %s", cid, response.status_code, response.text)
+    except (httpx.HTTPError, ValueError, KeyError) as e:
+        logger.error("Exception in get_inchikey_from_pubchem for CID %s: %s", cid, e)
     return None
 
-def get_names_from_pubchem(cid: str) -> dict:
+async def get_names_from_pubchem(cid: str) -> dict:
     iupac_name = None
     common_name = None
+    if str(cid) in _pubchem_properties_cache and str(cid) in _pubchem_synonyms_cache:
+        synonyms = _pubchem_synonyms_cache[str(cid)]
+        return {
+            "iupac_name": _pubchem_properties_cache[str(cid)].get('IUPACName'),
+            "common_name": synonyms[0] if synonyms else None,
+        }
     try:
-        response = requests.get(
-            f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/cid/{cid}/synonyms/JSON",
-            verify=False
+        response, response_iupac = await asyncio.gather(
+            _get(PUBCHEM_SYNONYMS_URL(cid)),
+            _get(PUBCHEM_PROPERTY_URL(cid, "IUPACName")),
         )
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             synonyms = data['InformationList']['Information'][0]['Synonym']
             if synonyms:
                 common_name = synonyms[0]
         else:
-            logger.debug(f"PubChem Synonyms API failed for CID {cid}: {response.status_code} - {response.text}")
+            logger.debug("PubChem Synonyms API failed for CID %s: %s - %s", cid, response.status_code, response.text)
 
-        response_iupac = requests.get(
-            f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/cid/{cid}/property/IUPACName/JSON",
-            verify=False
-        )
         if response_iupac.status_code == 200:
-            data_iupac = response_iupac.json()
+            data_iupac = orjson.loads(response_iupac.content)
             iupac_name = data_iupac['PropertyTable']['Properties'][0]['IUPACName']
         else:
-            logger.debug(f"PubChem IUPAC API failed for CID {cid}: {response_iupac.status_code} - {response_iupac.text}")
-    except (requests.exceptions.RequestException, KeyError) as e:
-        logger.error(f"Exception in get_names_from_pubchem for CID {cid}: {e}")
+            logger.debug("PubChem IUPAC API failed for CID %s: %s - %s", cid, response_iupac.status_code, response_iupac.text)
+    except (httpx.HTTPError, ValueError, KeyError) as e:
+        logger.error("Exception in get_names_from_pubchem for CID %s: %s", cid, e)
     return {"iupac_name": iupac_name, "common_name": common_name}
 
-def generate_2d_structure_svg(smiles: str) -> Union[str, None]:
+# Stored SVGs are zlib-compressed: the markup is highly repetitive XML, so the
+# blob is about a sixth of the text, and it is only inflated when a compound
+# page is rendered.
+SVG_COMPRESSION_LEVEL = 6
+
+def compress_svg(svg: Union[str, None]) -> Union[bytes, None]:
+    return zlib.compress(svg.encode('utf-8'), SVG_COMPRESSION_LEVEL) if svg else None
+
+def decompress_svg(blob: Union[bytes, str, None]) -> Union[str, None]:
+    """Inverse of compress_svg; text values (rows not yet migrated) pass through."""
+    if isinstance(blob, bytes):
+        return zlib.decompress(blob).decode('utf-8')
+    return blob
+
+# --- RDKit helpers ---
+# Parsed molecules are shared process-wide by SMILES: the pipeline and the seed
+# parse the same strings several times per compound. Nothing downstream mutates
+# them (drawing works on a prepared copy; descriptors, InChI and fingerprints
+# only read), so the cached Mol is handed out as is. Invalid SMILES cache None.
+
+@lru_cache(maxsize=4096)
+def _mol(smiles: str) -> Union[Chem.Mol, None]:
+    return Chem.MolFromSmiles(smiles)
+
+# A drawer cannot be reused once FinishDrawing() has run, so only its option
+# values are shared; they are applied to each new drawer.
+SVG_SIZE = (300, 300)
+SVG_DRAW_OPTIONS = {"addStereoAnnotation": True, "addAtomIndices": False}
+
+def _draw_2d_structure_svg(mol: Chem.Mol) -> str:
+    drawer = MolDraw2DSVG(*SVG_SIZE)
+    options = drawer.drawOptions()
+    for name, value in SVG_DRAW_OPTIONS.items():
+        setattr(options, name, value)
+    drawer.DrawMolecule(mol)
+    drawer.FinishDrawing()
+    return drawer.GetDrawingText()
+
+def generate_2d_structure_svg(smiles: str, mol: Union[Chem.Mol, None] = None) -> Union[str, None]:
+    """Renders the structure as SVG; pass ``mol`` when the SMILES has already been parsed."""
     try:
-        mol = Chem.MolFromSmiles(smiles)
+        if mol is None:
+            mol = _mol(smiles)
         if mol:
-            drawer = MolDraw2DSVG(300, 300)
-            drawer.drawOptions().addStereoAnnotation = True
-            drawer.drawOptions().addAtomIndices = False
-            drawer.DrawMolecule(mol)
-            drawer.FinishDrawing()
-            return drawer.GetDrawingText()
+            return _draw_2d_structure_svg(mol)
     except Exception as e:
-        logger.error(f"Error generating 2D structure SVG for SMILES {smiles}: {e}")
+        logger.error("Error generating 2D structure SVG for SMILES %s: %s", smiles, e)
     return None
 
+# Names that resolve to the same structure repeat across a seed run, so InChI
+# derivation and standardization are memoized by SMILES string.
+
+@lru_cache(maxsize=1024)
+def smiles_to_inchi(smiles: str) -> Tuple[str, str]:
+    """Returns (InChI, InChIKey) for a SMILES string.
+
+    The structure goes through the InChI library once; the key is a hash of the
+    InChI string (Chem.MolToInchiKey would recompute the InChI to get it).
+    """
+    inchi = Chem.MolToInchi(_mol(smiles))
+    return inchi, Chem.InchiToInchiKey(inchi)
+
+_standardize_smiles = lru_cache(maxsize=1024)(standardize_smiles)
+
+# Morgan radius 2 (ECFP4), 2048 bits. Fingerprints are stored as
+# ExplicitBitVect.ToBinary() blobs; load them back with DataStructs.ExplicitBitVect(blob).
+_MFPGEN = rdFingerprintGenerator.GetMorganGenerator(radius=2, fpSize=2048)
+
+def fingerprint_from_bitstring(bits: str) -> bytes:
+    """Converts a legacy '0'/'1' fingerprint string to the stored binary form."""
+    return DataStructs.CreateFromBitString(bits).ToBinary()
+
+def compute_rdkit_properties(smiles: str, mol: Union[Chem.Mol, None] = None, generate_svg: bool = True) -> dict:
+    """CPU stage of the pipeline: everything derived from the final SMILES without network access.
+
+    Kept at module level (and fed only a SMILES string) so batch callers can run it in a process pool.
+    Batch callers may pass ``generate_svg=False`` and render SVGs later, only for rows they keep.
+    """
+    structure_2d_svg = None
+    molecular_formula = None
+    molecular_weight = None
+    smiles_normalized = None
+    fingerprint = None
+
+    if mol is None:
+        mol = _mol(smiles)
+    if mol:
+        if generate_svg:
+            structure_2d_svg = generate_2d_structure_svg(smiles, mol)
+        try:
+            molecular_formula = rdMolDescriptors.CalcMolFormula(mol)
+            molecular_weight = rdMolDescriptors.CalcExactMolWt(mol)
+            logger.debug("Calculated Molecular Formula: %s, Molecular Weight: %s", molecular_formula, molecular_weight)
+        except Exception as e:
+            logger.error("Error calculating molecular formula or weight for SMILES %s: %s", smiles, e)
+
+    try:
+        smiles_normalized = _standardize_smiles(smiles)
+        norm_mol = _mol(smiles_normalized) # Use normalized SMILES for fingerprint
+        if norm_mol:
+            fingerprint = _MFPGEN.GetFingerprint(norm_mol).ToBinary()
+    except Exception as e:
+        logger.error("Error standardizing SMILES or calculating fingerprint for %s: %s", smiles, e)
+
+    return {
+        "smiles_normalized": smiles_normalized,
+        "structure_2d_svg": structure_2d_svg,
+        "molecular_formula": molecular_formula,
+        "molecular_weight": molecular_weight,
+        "fingerprint": fingerprint,
+    }
+
 # --- UniChem API Functions for DrugBank mapping ---
 
 _unichem_drugbank_src_id_cache: Union[str, None] = None
 
-def _get_unichem_drugbank_src_id() -> Union[str, None]:
+async def _get_unichem_drugbank_src_id() -> Union[str, None]:
     global _unichem_drugbank_src_id_cache
     if _unichem_drugbank_src_id_cache is not None:
         logger.debug("UniChem DrugBank source ID from cache.")
         return _unichem_drugbank_src_id_cache
     try:
-        resp = requests.get("https://www.ebi.ac.uk/unichem/rest/sources", timeout=15, verify=False)
+        resp = await _get(UNICHEM_SOURCES_URL)
         if resp.status_code != 200:
-            logger.debug(f"UniChem sources API failed: {resp.status_code} - {resp.text}")
+            logger.debug("UniChem sources API failed: %s - %s", resp.status_code, resp.text)
             return None
-        sources = resp.json()
+        sources = orjson.loads(resp.content)
         # Find DrugBank source id by name match
         for src in sources:
             name = str(src.get('name', '')).lower()
             if 'drugbank' in name:
                 _unichem_drugbank_src_id_cache = str(src.get('src_id'))
-                logger.debug(f"UniChem DrugBank source ID found: {_unichem_drugbank_src_id_cache}")
+                logger.debug("UniChem DrugBank source ID found: %s", _unichem_drugbank_src_id_cache)
                 break
         if not _unichem_drugbank_src_id_cache:
             logger.debug("DrugBank source not found in UniChem sources list")
         return _unichem_drugbank_src_id_cache
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Exception fetching UniChem sources: {e}")
+    except (httpx.HTTPError, ValueError) as e:
+        logger.error("Exception fetching UniChem sources: %s", e)
         return None
 
 
-def get_drugbank_url_from_inchikey(inchikey: str) -> Union[str, None]:
-    logger.debug(f"Attempting to get DrugBank URL for InChIKey: {inchikey}")
+async def get_drugbank_url_from_inchikey(inchikey: str) -> Union[str, None]:
+    logger.debug("Attempting to get DrugBank URL for InChIKey: %s", inchikey)
     try:
-        src_id = _get_unichem_drugbank_src_id()
-        logger.debug(f"UniChem DrugBank source ID used: {src_id}")
+        src_id = await _get_unichem_drugbank_src_id()
+        logger.debug("UniChem DrugBank source ID used: %s", src_id)
         if not src_id:
             logger.debug("No UniChem DrugBank source ID available.")
             return None
         # Query UniChem for all sources mapped to this InChIKey
-        resp = requests.get(f"https://www.ebi.ac.uk/unichem/rest/inchikey/{inchikey}", timeout=15, verify=False)
-        logger.debug(f"UniChem inchikey API response status for {inchikey}: {resp.status_code}")
+        resp = await _get(UNICHEM_INCHIKEY_URL(inchikey))
+        logger.debug("UniChem inchikey API response status for %s: %s", inchikey, resp.status_code)
         if resp.status_code != 200:
-            logger.debug(f"UniChem inchikey API failed for {inchikey}: {resp.status_code} - {resp.text}")
+            logger.debug("UniChem inchikey API failed for %s: %s - %s", inchikey, resp.status_code, resp.text)
             return None
-        mappings = resp.json() or []
-        logger.debug(f"UniChem mappings for {inchikey}: {json.dumps(mappings, indent=2)}")
+        mappings = orjson.loads(resp.content) or []
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("UniChem mappings for %s: %s", inchikey, json.dumps(mappings, indent=2))
         # mappings expected: list of {'src_id': '2', 'src_compound_id': 'DB01050', ...}
         db_id = None
         for m in mappings:
             if str(m.get('src_id')) == str(src_id):
                 db_id = m.get('src_compound_id')
                 if db_id:
-                    logger.debug(f"DrugBank ID found in mappings: {db_id}")
+                    logger.debug("DrugBank ID found in mappings: %s", db_id)
                     break
         if not db_id:
-            logger.debug(f"No DrugBank ID found in UniChem mappings for {inchikey}.")
+            logger.debug("No DrugBank ID found in UniChem mappings for %s.", inchikey)
             return None
         # Build modern DrugBank URL
-        drugbank_url = f"https://go.drugbank.com/drugs/{db_id}"
-        logger.debug(f"Constructed DrugBank URL: {drugbank_url}")
+        drugbank_url = DRUGBANK_DRUG_URL(db_id)
+        logger.debug("Constructed DrugBank URL: %s", drugbank_url)
         return drugbank_url
-    except (requests.exceptions.RequestException, ValueError) as e:
-        logger.error(f"Exception in get_drugbank_url_from_inchikey for {inchikey}: {e}")
+    except (httpx.HTTPError, ValueError) as e:
+        logger.error("Exception in get_drugbank_url_from_inchikey for %s: %s", inchikey, e)
         return None
 
-def get_drugbank_url_from_pubchem_cid(cid: str) -> Union[str, None]:
+async def get_drugbank_url_from_pubchem_cid(cid: str) -> Union[str, None]:
     """Fallback: Use PubChem xrefs to get DrugBank accession from a CID."""
     # Try dedicated DrugBank xrefs endpoint if supported
     try:
-        resp = requests.get(
-            f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/cid/{cid}/xrefs/DrugBank/JSON",
-            verify=False,
-            timeout=20,
-        )
+        resp = await _get(PUBCHEM_DRUGBANK_XREFS_URL(cid))
         if resp.status_code == 200:
-            data = resp.json()
+            data = orjson.loads(resp.content)
             # Expected structure: InformationList -> Information[0] -> DrugBank -> ["DBxxxx"]
             info_list = data.get('InformationList', {}).get('Information', [])
             if info_list:
                 db_ids = info_list[0].get('DrugBank') or []
                 if db_ids:
-                    return f"https://go.drugbank.com/drugs/{db_ids[0]}"
-    except (requests.exceptions.RequestException, ValueError, KeyError) as e:
-        logger.debug(f"PubChem DrugBank xrefs endpoint failed for CID {cid}: {e}")
+                    return DRUGBANK_DRUG_URL(db_ids[0])
+    except (httpx.HTTPError, ValueError, KeyError) as e:
+        logger.debug("PubChem DrugBank xrefs endpoint failed for CID %s: %s", cid, e)
 
     # Fallback to RegistryID filtered by DrugBank source parameter
     try:
-        resp = requests.get(
-            f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/cid/{cid}/xrefs/RegistryID/JSON?source=DrugBank",
-            verify=False,
-            timeout=20,
-        )
+        resp = await _get(PUBCHEM_REGISTRY_XREFS_URL(cid))
         if resp.status_code == 200:
-            data = resp.json()
+            data = orjson.loads(resp.content)
             info_list = data.get('InformationList', {}).get('Information', [])
             if info_list:
                 ids = info_list[0].get('RegistryID') or []
                 # Typically contains the DB accession
                 for reg in ids:
                     if isinstance(reg, str) and reg.upper().startswith('DB'):
-                        return f"https://go.drugbank.com/drugs/{reg}"
-    except (requests.exceptions.RequestException, ValueError, KeyError) as e:
-        logger.debug(f"PubChem RegistryID xrefs fallback failed for CID {cid}: {e}")
+                        return DRUGBANK_DRUG_URL(reg)
+    except (httpx.HTTPError, ValueError, KeyError) as e:
+        logger.debug("PubChem RegistryID xrefs fallback failed for CID %s: %s", cid, e)
 
     return None
 
 # --- ChEMBL API Functions ---
 
-def get_smiles_from_chembl(identifier: str) -> Union[str, None]:
+async def get_smiles_from_chembl(identifier: str) -> Union[str, None]:
     try:
-        search_url = f"https://www.ebi.ac.uk/chembl/api/data/molecule.json?molecule_synonyms__molecule_synonym__iexact={urllib.parse.quote(identifier)}"
-        response = requests.get(search_url, verify=False)
+        response = await _get(CHEMBL_SYNONYM_SEARCH_URL(_quote(identifier)))
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             if data and 'molecules' in data and len(data['molecules']) > 0:
                 molecule = data['molecules'][0]
                 if (
@@ -261,17 +550,22 @@ def get_smiles_from_chembl(identifier: str) -> Union[str, None]:
                 ):
                     return molecule['molecule_structures']['canonical_smiles']
             else:
-                logger.debug(f"ChEMBL API returned no molecules for {identifier}")
+                logger.debug("ChEMBL API returned no molecules for %s", identifier)
         else:
-            logger.debug(f"ChEMBL API failed for {identifier}: {response.status_code} - {response.text}")
-    except (requests.exceptions.RequestException, KeyError) as e:
-        logger.error(f"Exception in get_smiles_from_chembl for {identifier}: {e}")
+            logger.debug("ChEMBL API failed for %s: %s - %s", identifier, response.status_code, response.text)
+    except (httpx.HTTPError, ValueError, KeyError) as e:
+        logger.error("Exception in get_smiles_from_chembl for %s: %s", identifier, e)
     return None
 
 # --- Core Data Generation Function ---
 
-def get_compound_data(identifier: str) -> dict:
-    logger.debug(f"Starting get_compound_data for identifier: {identifier}")
+async def get_compound_data_async(identifier: str, compute_properties: bool = True) -> dict:
+    """Resolves an identifier to a compound record.
+
+    With ``compute_properties=False`` only the network (I/O) stage runs and the
+    compute_rdkit_properties() fields are left as None for the caller to fill in.
+    """
+    logger.debug("Starting get_compound_data for identifier: %s", identifier)
     if not identifier:
         logger.debug("Identifier is empty.")
         return {"error": "Identifier cannot be empty."}
@@ -280,29 +574,29 @@ def get_compound_data(identifier: str) -> dict:
     iupac_name = None
     common_name = None
     sources = []
+    seen_sources = set() # db_names already in sources
     pubchem_cid = None
     inchi = None
     inchi_key = None
-    structure_2d_svg = None # Re-initialize
-    molecular_formula = None # Re-initialize
-    molecular_weight = None # Re-initialize
-    smiles_normalized = None # Re-initialize
 
     # Helper to add a source only once
     def add_source(db_name: str, url: str) -> None:
-        nonlocal sources
-        if not any(s.get('db_name') == db_name for s in sources):
+        if db_name not in seen_sources:
+            seen_sources.add(db_name)
             sources.append({'db_name': db_name, 'url': url})
 
+    # Neither depends on the PubChem CID, so they run while it is resolved
+    chembl_task = asyncio.ensure_future(get_smiles_from_chembl(identifier))
+    unichem_task = asyncio.ensure_future(_get_unichem_drugbank_src_id())
+
     # 1. Try to parse identifier as SMILES
     try:
-        mol_from_smiles = Chem.MolFromSmiles(identifier)
-        if mol_from_smiles:
+        if _mol(identifier):
             smiles = identifier
             add_source('User-provided', '#')
-            logger.debug(f"Identifier recognized as SMILES: {smiles}")
+            logger.debug("Identifier recognized as SMILES: %s", smiles)
     except Exception as e:
-        logger.debug(f"Failed to parse identifier as SMILES: {e}")
+        logger.debug("Failed to parse identifier as SMILES: %s", e)
 
     # 2. Attempt PubChem search (by name or InChIKey if SMILES was found)
     current_pubchem_cid = None
@@ -314,130 +608,129 @@ def get_compound_data(identifier: str) -> dict:
     if not current_pubchem_cid and looks_like_inchikey(identifier):
         inchi_key = identifier
         try:
-            current_pubchem_cid = get_cid_from_inchikey(inchi_key)
+            current_pubchem_cid = await get_cid_from_inchikey(inchi_key)
         except Exception as e:
-            logger.debug(f"Failed to resolve CID from provided InChIKey {inchi_key}: {e}")
+            logger.debug("Failed to resolve CID from provided InChIKey %s: %s", inchi_key, e)
 
     if smiles: # If SMILES was provided, try to get CID from its InChIKey
         try:
-            mol = Chem.MolFromSmiles(smiles)
-            if mol:
-                inchi = Chem.MolToInchi(mol)
-                inchi_key = Chem.InchiToInchiKey(inchi)
-                logger.debug(f"Derived InChIKey from SMILES: {inchi_key}")
-                current_pubchem_cid = get_cid_from_inchikey(inchi_key)
+            inchi, inchi_key = smiles_to_inchi(smiles)
+            logger.debug("Derived InChIKey from SMILES: %s", inchi_key)
+            current_pubchem_cid = await get_cid_from_inchikey(inchi_key)
         except Exception as e:
-            logger.error(f"Error getting InChIKey/CID from SMILES: {e}")
+            logger.error("Error getting InChIKey/CID from SMILES: %s", e)
     
     if not current_pubchem_cid: # If no CID yet, try by identifier name
-        current_pubchem_cid = get_cid_from_pubchem(identifier)
+        current_pubchem_cid = await get_cid_from_pubchem(identifier)
 
     if current_pubchem_cid:
-        logger.debug(f"PubChem CID {current_pubchem_cid} found for {identifier}.")
+        logger.debug("PubChem CID %s found for %s.", current_pubchem_cid, identifier)
         pubchem_cid = current_pubchem_cid # Set the main pubchem_cid
         # Always add PubChem source link when CID is available
-        add_source('PubChem', f"https://pubchem.ncbi.nlm.nih.gov/compound/{pubchem_cid}")
+        add_source('PubChem', PUBCHEM_COMPOUND_PAGE_URL(pubchem_cid))
 
+        # SMILES, names and InChIKey only need the CID, so fetch them together
+        lookups = [get_smiles_from_pubchem(pubchem_cid), get_names_from_pubchem(pubchem_cid)]
         # Ensure we fetch InChIKey from PubChem whenever CID is available
         if not inchi_key:
-            fetched_inchi_key = get_inchikey_from_pubchem(pubchem_cid)
-            if fetched_inchi_key:
-                inchi_key = fetched_inchi_key
+            lookups.append(get_inchikey_from_pubchem(pubchem_cid))
+        pubchem_smiles, names, *fetched_inchi_key = await asyncio.gather(*lookups)
+        if fetched_inchi_key and fetched_inchi_key[0]:
+            inchi_key = fetched_inchi_key[0]
 
         # Try to get SMILES and names from PubChem if CID is available
-        pubchem_smiles = get_smiles_from_pubchem(pubchem_cid)
         if pubchem_smiles:
             if not smiles: # Only set smiles if not already found
                 smiles = pubchem_smiles
             
             # Get names from PubChem
-            names = get_names_from_pubchem(pubchem_cid)
             if names['iupac_name']:
                 iupac_name = names['iupac_name']
             if names['common_name']:
                 common_name = names['common_name']
         else:
-            logger.debug(f"No SMILES found from PubChem for CID {pubchem_cid}.")
-
-    # 3. Attempt ChEMBL search
-    chembl_smiles = get_smiles_from_chembl(identifier)
-    if chembl_smiles:
-        if not smiles: # Only set smiles if not already found
+            logger.debug("No SMILES found from PubChem for CID %s.", pubchem_cid)
+
+    # 3. Attempt ChEMBL search. It was started speculatively; its SMILES is only
+    # needed here when PubChem found none. Otherwise only its source link is
+    # used, so it is awaited after step 5 and its latency stays hidden.
+    chembl_slot = len(sources) # keeps ChEMBL listed before DrugBank either way
+    if not smiles:
+        chembl_smiles = await chembl_task
+        if chembl_smiles:
             smiles = chembl_smiles
-        add_source('ChEMBL', f"https://www.ebi.ac.uk/chembl/g/#search_results/all/query={urllib.parse.quote(identifier)}")
+            add_source('ChEMBL', CHEMBL_SEARCH_PAGE_URL(_quote(identifier)))
 
-    # 4. After all SMILES attempts, if SMILES is available, generate SVG and derive InChI/InChIKey
+    # 4. After all SMILES attempts, parse the final SMILES once for the RDKit steps below
+    mol = None
     if smiles:
-        structure_2d_svg = generate_2d_structure_svg(smiles)
+        mol = _mol(smiles)
+
+    # Derive InChI/InChIKey (needed for the DrugBank lookup, so it stays in the I/O stage).
+    # A user-provided SMILES is never replaced, so if step 2 already derived them
+    # from it there is nothing left to do.
+    if mol and inchi is None:
         try:
-            mol = Chem.MolFromSmiles(smiles)
-            if mol:
-                inchi = Chem.MolToInchi(mol)
-                inchi_key = Chem.InchiToInchiKey(inchi)
-                logger.debug(f"Derived InChIKey: {inchi_key}")
+            inchi, inchi_key = smiles_to_inchi(smiles)
+            logger.debug("Derived InChIKey: %s", inchi_key)
         except Exception as e:
-            logger.error(f"Error deriving InChI/InChIKey from SMILES {smiles}: {e}")
+            logger.error("Error deriving InChI/InChIKey from SMILES %s: %s", smiles, e)
 
     # 5. Populate DrugBank source if possible via UniChem
-    logger.debug(f"Attempting DrugBank URL resolution with InChIKey: {inchi_key}")
+    await unichem_task  # warms the source ID cache used below
+    logger.debug("Attempting DrugBank URL resolution with InChIKey: %s", inchi_key)
     if inchi_key:
-        drugbank_url = get_drugbank_url_from_inchikey(inchi_key)
+        drugbank_url = await get_drugbank_url_from_inchikey(inchi_key)
         if drugbank_url:
             add_source('DrugBank', drugbank_url)
-            logger.debug(f"DrugBank URL successfully added: {drugbank_url}")
+            logger.debug("DrugBank URL successfully added: %s", drugbank_url)
         else:
             logger.debug("DrugBank URL not found via UniChem for this InChIKey.")
     else:
         logger.debug("InChIKey not available for DrugBank URL resolution.")
 
     # 5b. If UniChem did not yield DrugBank, try PubChem xrefs fallback
-    if not any(s['db_name'] == 'DrugBank' for s in sources) and pubchem_cid:
-        db_url_from_pubchem = get_drugbank_url_from_pubchem_cid(pubchem_cid)
+    if 'DrugBank' not in seen_sources and pubchem_cid:
+        db_url_from_pubchem = await get_drugbank_url_from_pubchem_cid(pubchem_cid)
         if db_url_from_pubchem:
             add_source('DrugBank', db_url_from_pubchem)
-            logger.debug(f"DrugBank URL successfully added via PubChem xrefs: {db_url_from_pubchem}")
+            logger.debug("DrugBank URL successfully added via PubChem xrefs: %s", db_url_from_pubchem)
 
-    if smiles:
-        try:
-            mol = Chem.MolFromSmiles(smiles)
-            if mol:
-                molecular_formula = rdMolDescriptors.CalcMolFormula(mol)
-                molecular_weight = rdMolDescriptors.CalcExactMolWt(mol)
-                logger.debug(f"Calculated Molecular Formula: {molecular_formula}, Molecular Weight: {molecular_weight}")
-        except Exception as e:
-            logger.error(f"Error calculating molecular formula or weight for SMILES {smiles}: {e}")
+    if 'ChEMBL' not in seen_sources and await chembl_task:
+        seen_sources.add('ChEMBL')
+        sources.insert(chembl_slot, {'db_name': 'ChEMBL', 'url': CHEMBL_SEARCH_PAGE_URL(_quote(identifier))})
 
-    smiles_normalized = None
-    fingerprint = None # Initialize fingerprint
-    if smiles:
-        try:
-            smiles_normalized = standardize_smiles(smiles)
-            mol = Chem.MolFromSmiles(smiles_normalized) # Use normalized SMILES for fingerprint
-            if mol:
-                # Calculate Morgan fingerprint (ECFP4, 2048 bits)
-                fingerprint = AllChem.GetMorganFingerprintAsBitVect(mol, 2, nBits=2048).ToBitString()
-        except Exception as e:
-            logger.error(f"Error standardizing SMILES or calculating fingerprint for {smiles}: {e}")
+    if smiles and compute_properties:
+        properties = compute_rdkit_properties(smiles, mol)
+    else:
+        properties = dict.fromkeys(("smiles_normalized", "structure_2d_svg", "molecular_formula", "molecular_weight", "fingerprint"))
 
     return {
         "smiles_raw": smiles,
-        "smiles_normalized": smiles_normalized,
+        "smiles_normalized": properties["smiles_normalized"],
         "iupac_name": iupac_name,
         "common_name": common_name,
         "sources": sources,
         "pubchem_cid": pubchem_cid,
-        "structure_2d_svg": structure_2d_svg,
+        "structure_2d_svg": properties["structure_2d_svg"],
         "inchi": inchi,
         "inchi_key": inchi_key,
-        "molecular_formula": molecular_formula,
-        "molecular_weight": molecular_weight,
-        "fingerprint": fingerprint # Add fingerprint to the returned dictionary
+        "molecular_formula": properties["molecular_formula"],
+        "molecular_weight": properties["molecular_weight"],
+        "fingerprint": properties["fingerprint"] # Add fingerprint to the returned dictionary
     }
 
+def get_compound_data(identifier: str) -> dict:
+    """Synchronous entry point for callers outside the lookup loop."""
+    return run_sync(get_compound_data_async(identifier))
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Fetch and process chemical data.")
     parser.add_argument("identifier", type=str, help="The chemical identifier (name, SMILES, etc.).")
     args = parser.parse_args()
 
     result = get_compound_data(args.identifier)
+    if result.get("fingerprint"):
+        # Stored form is ExplicitBitVect.ToBinary() bytes; show the readable bit string
+        result["fingerprint"] = DataStructs.ExplicitBitVect(result["fingerprint"]).ToBitString()
     print(json.dumps(result, indent=4))
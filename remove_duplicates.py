@@ -1,53 +1,44 @@
 import sqlite3
 
-def remove_duplicates():
-    conn = sqlite3.connect('database.db')
-    cursor = conn.cursor()
+# Keep the lowest compound_id for each InChI Key and delete the rest in one statement
+DELETE_DUPLICATES_SQL = """
+    DELETE FROM compounds WHERE compound_id IN (
+        SELECT compound_id FROM (
+            SELECT compound_id,
+                   ROW_NUMBER() OVER (PARTITION BY inchi_key ORDER BY compound_id) AS rn
+            FROM compounds
+            WHERE inchi_key IS NOT NULL
+        ) WHERE rn > 1
+    )
+"""
+
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536", # 64 MB
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456", # 256 MB
+)
 
-    # Find all InChI Keys that have more than one entry
-    cursor.execute("""
-        SELECT inchi_key
-        FROM compounds
-        GROUP BY inchi_key
-        HAVING COUNT(inchi_key) > 1
-    """)
-    duplicate_keys = cursor.fetchall()
+def remove_duplicates():
+    # BEGIN IMMEDIATE: take the write lock before the DELETE starts scanning
+    conn = sqlite3.connect('database.db', isolation_level="IMMEDIATE")
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+
+    try:
+        # Single transaction: either every duplicate is removed or none are
+        with conn:
+            deleted = conn.execute(DELETE_DUPLICATES_SQL).rowcount
+    finally:
+        conn.close()
 
-    if not duplicate_keys:
+    if not deleted:
         print("No duplicate compounds found.")
-        conn.close()
         return
 
-    print(f"Found {len(duplicate_keys)} duplicate InChI Keys. Cleaning database...")
-
-    for key_tuple in duplicate_keys:
-        inchi_key = key_tuple[0]
-        print(f"  Processing duplicate InChI Key: {inchi_key}")
-
-        # Get all compound_ids for the duplicate InChI Key, ordered by ID
-        cursor.execute("""
-            SELECT compound_id
-            FROM compounds
-            WHERE inchi_key = ?
-            ORDER BY compound_id
-        """, (inchi_key,))
-        compound_ids = [row[0] for row in cursor.fetchall()]
-
-        # Keep the first one, delete the rest
-        ids_to_delete = compound_ids[1:]
-        
-        if ids_to_delete:
-            print(f"    Keeping compound_id {compound_ids[0]} and deleting IDs: {ids_to_delete}")
-            cursor.execute(f"""
-                DELETE FROM compounds
-                WHERE compound_id IN ({','.join('?' for _ in ids_to_delete)})
-            """, ids_to_delete)
-            conn.commit()
-        else:
-            print(f"    Found duplicate key but no extra records to delete for {inchi_key}. This is unusual.")
-
+    print(f"Deleted {deleted} duplicate compounds, keeping the first entry for each InChI Key.")
     print("\nDatabase cleaning complete.")
-    conn.close()
 
 if __name__ == '__main__':
-    remove_duplicates()
\ No newline at end of file
+    remove_duplicates()
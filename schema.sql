@@ -12,15 +12,83 @@ CREATE TABLE IF NOT EXISTS compounds (
     inchi TEXT,
     inchi_key TEXT UNIQUE,
     source_url TEXT,
-    structure_2d_svg TEXT,
+    structure_2d_svg BLOB, -- zlib-compressed SVG markup
     structure_3d_pdb TEXT,
-    fingerprint TEXT,
+    fingerprint BLOB, -- ExplicitBitVect.ToBinary()
     source_db TEXT,
     metadata TEXT, -- Storing JSON as TEXT in SQLite
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
--- Indexes for efficient searching
-CREATE INDEX IF NOT EXISTS idx_inchi_key ON compounds(inchi_key);
-CREATE INDEX IF NOT EXISTS idx_smiles_normalized ON compounds(smiles_normalized);
+-- Uploads are processed in the background; each submission is tracked here
+CREATE TABLE IF NOT EXISTS upload_jobs (
+    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    identifier TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending', -- pending, running, done or failed
+    compound_id INTEGER,
+    messages TEXT, -- JSON list of [category, message] pairs to flash
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Sort order of the paginated /search listing
+CREATE INDEX IF NOT EXISTS idx_compounds_name_sort ON compounds(IFNULL(common_name, '') COLLATE NOCASE, IFNULL(iupac_name, '') COLLATE NOCASE);
+
+-- Precomputed row count for the dashboard, kept current by triggers so the
+-- page never needs a COUNT(*) over the whole table
+CREATE TABLE IF NOT EXISTS compounds_stats (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+
+INSERT OR IGNORE INTO compounds_stats (key, value) SELECT 'count', COUNT(*) FROM compounds;
+
+CREATE TRIGGER IF NOT EXISTS compounds_count_ai AFTER INSERT ON compounds BEGIN
+    UPDATE compounds_stats SET value = value + 1 WHERE key = 'count';
+END;
+
+CREATE TRIGGER IF NOT EXISTS compounds_count_ad AFTER DELETE ON compounds BEGIN
+    UPDATE compounds_stats SET value = value - 1 WHERE key = 'count';
+END;
+
+-- Full-text index over the searchable columns. The trigram tokenizer keeps the
+-- case-insensitive substring semantics of the old LIKE '%query%' search.
+CREATE VIRTUAL TABLE IF NOT EXISTS compounds_fts USING fts5(
+    iupac_name, common_name, smiles_normalized, smiles_raw, inchi_key, molecular_formula,
+    content='compounds', content_rowid='compound_id', tokenize='trigram'
+);
+
+-- Keep compounds_fts in sync with compounds
+CREATE TRIGGER IF NOT EXISTS compounds_fts_ai AFTER INSERT ON compounds BEGIN
+    INSERT INTO compounds_fts(rowid, iupac_name, common_name, smiles_normalized, smiles_raw, inchi_key, molecular_formula)
+    VALUES (new.compound_id, new.iupac_name, new.common_name, new.smiles_normalized, new.smiles_raw, new.inchi_key, new.molecular_formula);
+END;
+
+CREATE TRIGGER IF NOT EXISTS compounds_fts_ad AFTER DELETE ON compounds BEGIN
+    INSERT INTO compounds_fts(compounds_fts, rowid, iupac_name, common_name, smiles_normalized, smiles_raw, inchi_key, molecular_formula)
+    VALUES ('delete', old.compound_id, old.iupac_name, old.common_name, old.smiles_normalized, old.smiles_raw, old.inchi_key, old.molecular_formula);
+END;
+
+CREATE TRIGGER IF NOT EXISTS compounds_fts_au AFTER UPDATE ON compounds BEGIN
+    INSERT INTO compounds_fts(compounds_fts, rowid, iupac_name, common_name, smiles_normalized, smiles_raw, inchi_key, molecular_formula)
+    VALUES ('delete', old.compound_id, old.iupac_name, old.common_name, old.smiles_normalized, old.smiles_raw, old.inchi_key, old.molecular_formula);
+    INSERT INTO compounds_fts(rowid, iupac_name, common_name, smiles_normalized, smiles_raw, inchi_key, molecular_formula)
+    VALUES (new.compound_id, new.iupac_name, new.common_name, new.smiles_normalized, new.smiles_raw, new.inchi_key, new.molecular_formula);
+END;
+
+-- Indexes for efficient searching. The duplicate checks only select
+-- compound_id (the rowid), so each of these answers its lookup on its own.
+-- They are UNIQUE so that inserts reject duplicates themselves
+-- (INSERT ... ON CONFLICT DO NOTHING); the partial ones ignore missing values.
+-- They come last so an existing database with duplicate rows still gets the
+-- stats and FTS tables above; init_db checks for such rows before running this.
+DROP INDEX IF EXISTS idx_inchi_key;
+DROP INDEX IF EXISTS idx_smiles_normalized;
+DROP INDEX IF EXISTS idx_compounds_smiles_norm;
+DROP INDEX IF EXISTS idx_compounds_smiles_raw;
+DROP INDEX IF EXISTS idx_compounds_common_name_nocase;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_compounds_inchi_key ON compounds(inchi_key);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_compounds_smiles_norm_uq ON compounds(smiles_normalized) WHERE smiles_normalized IS NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_compounds_smiles_raw_uq ON compounds(smiles_raw) WHERE smiles_raw IS NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_compounds_common_name_nocase_uq ON compounds(common_name COLLATE NOCASE) WHERE common_name IS NOT NULL;
@@ -1,15 +1,32 @@
 import os
 import sqlite3
 import json
+import asyncio
+import multiprocessing
 import requests
 import urllib.parse
-from gui_app.normalize_compound import get_compound_data
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from gui_app.normalize_compound import (
+    compress_svg, compute_rdkit_properties, generate_2d_structure_svg, get_cid_from_pubchem,
+    get_compound_data_async, prefetch_pubchem_records, run_sync,
+)
 
 # Configuration
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATABASE_PATH = os.path.join(BASE_DIR, 'database.db')
 SCHEMA_PATH = os.path.join(BASE_DIR, 'schema.sql')
 
+# Bulk-ingest settings applied to every connection: WAL with synchronous=NORMAL
+# avoids an fsync per commit, plus a 64 MB page cache and 256 MB of mmap
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
 # List of common antibiotics for seeding
 ANTIBIOTICS_TO_ADD = [
     "Penicillin G", "Amoxicillin", "Tetracycline", "Ciprofloxacin",
@@ -38,7 +55,10 @@ ANTIBIOTICS_TO_ADD = [
 def get_db_connection():
     """Establishes a connection to the SQLite database."""
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
+        # Writes take the lock up front (BEGIN IMMEDIATE) instead of upgrading mid-transaction
+        conn = sqlite3.connect(DATABASE_PATH, isolation_level="IMMEDIATE")
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
         return conn
     except sqlite3.Error as e:
         print(f"Database connection error: {e}")
@@ -50,6 +70,10 @@ def init_db():
     if os.path.exists(DATABASE_PATH):
         os.remove(DATABASE_PATH)
         print("Removed existing database file.")
+    # A leftover WAL must not be replayed into the fresh database
+    for suffix in ('-wal', '-shm'):
+        if os.path.exists(DATABASE_PATH + suffix):
+            os.remove(DATABASE_PATH + suffix)
 
     conn = get_db_connection()
     if not conn:
@@ -69,15 +93,38 @@ def init_db():
     finally:
         conn.close()
 
-def fetch_compounds_by_name_list(compound_names: list, limit: int = 100) -> list:
-    """Fetches compounds by a list of names and filters for ChEMBL/PubChem sources."""
+async def fetch_all(compound_names: list, concurrency: int = 8) -> list:
+    """Looks up every name concurrently, returning (name, compound_data) pairs in input order."""
+    # PubChem's request rate is limited inside normalize_compound, per request
+    sem = asyncio.Semaphore(concurrency)
+
+    async def cid(name):
+        async with sem:
+            return await get_cid_from_pubchem(name)
+
+    # Resolve every name first so PubChem properties and synonyms can be fetched
+    # for all CIDs in a couple of batched requests; the per-name pipeline below
+    # then finds them (and the name -> CID answers) already cached.
+    print("Resolving PubChem CIDs...")
+    await prefetch_pubchem_records(await asyncio.gather(*(cid(name) for name in compound_names)))
+
+    async def one(name):
+        async with sem:
+            print(f"Processing: {name}")
+            return name, await get_compound_data_async(name, compute_properties=False)
+
+    return await asyncio.gather(*(one(name) for name in compound_names))
+
+def fetch_compounds_by_name_list(compound_names: list, limit: int = 100, known_inchi_keys: frozenset = frozenset()) -> list:
+    """Fetches compounds by a list of names and filters for ChEMBL/PubChem sources.
+
+    Compounds whose InChIKey is in known_inchi_keys are still returned but skip the CPU stage.
+    """
     compounds = []
     print(f"Searching for compounds from provided list...")
-    for name in compound_names:
+    for name, compound_data in run_sync(fetch_all(compound_names)):
         if len(compounds) >= limit:
             break
-        print(f"Processing: {name}")
-        compound_data = get_compound_data(name)
 
         if 'error' not in compound_data and compound_data.get('inchi_key'):
             compounds.append(compound_data)
@@ -86,6 +133,16 @@ def fetch_compounds_by_name_list(compound_names: list, limit: int = 100) -> list
             error_msg = compound_data.get('error', 'No InChIKey found')
             print(f"  -> Skipped {name} (Error: {error_msg}).")
 
+    # CPU stage: standardization, descriptors, fingerprints and SVGs are GIL-bound,
+    # so spread them over a process pool. "spawn" because this process already runs
+    # the lookup loop's thread, which makes fork unsafe. SVGs are left to
+    # seed_database, which only renders them for rows it will insert.
+    with_smiles = [data for data in compounds if data.get('smiles_raw') and data['inchi_key'] not in known_inchi_keys]
+    print(f"Computing structure properties for {len(with_smiles)} compounds...")
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn")) as executor:
+        for data, properties in zip(with_smiles, executor.map(partial(compute_rdkit_properties, generate_svg=False), [d['smiles_raw'] for d in with_smiles], chunksize=8)):
+            data.update(properties)
+
     print(f"Finished fetching compounds. Total found: {len(compounds)}")
     return compounds
 
@@ -101,53 +158,57 @@ def seed_database():
     skipped_count = 0
 
     try:
-        cursor = conn.cursor()
+        # Read the stored InChIKeys once; compounds already in the database skip
+        # the CPU stage and SVG rendering and are never sent to the INSERT
+        existing = {key for (key,) in conn.execute("SELECT inchi_key FROM compounds WHERE inchi_key IS NOT NULL")}
 
         # Fetch compounds dynamically
-        compounds_to_insert = fetch_compounds_by_name_list(ANTIBIOTICS_TO_ADD, limit=100)
+        compounds_to_insert = fetch_compounds_by_name_list(ANTIBIOTICS_TO_ADD, limit=100, known_inchi_keys=frozenset(existing))
 
+        # Several names can resolve to the same compound; keep the first of each
+        # so the SVG is rendered once, and only for rows that can be inserted
+        seen_inchi_keys = existing
+        unique_compounds = []
         for data in compounds_to_insert:
-            print(f"Processing: {data.get('common_name', data.get('iupac_name', 'Unknown'))}")
-
-            # Check if the compound already exists using inchi_key
-            cursor.execute("SELECT compound_id FROM compounds WHERE inchi_key = ?", (data['inchi_key'],))
-            if cursor.fetchone():
-                print("  -> Compound already exists. Skipping.")
+            if data['inchi_key'] in seen_inchi_keys:
                 skipped_count += 1
                 continue
+            seen_inchi_keys.add(data['inchi_key'])
+            if data['smiles_raw']:
+                data['structure_2d_svg'] = generate_2d_structure_svg(data['smiles_raw'])
+            unique_compounds.append(data)
 
-            # Prepare sources for storage
-            sources_json = json.dumps(data.get('sources', []))
-
-            # Insert the new compound
-            sql = """
-            INSERT INTO compounds (
-                iupac_name, common_name, smiles_raw, smiles_normalized, inchi, inchi_key, 
-                molecular_formula, molecular_weight, fingerprint, structure_2d_svg, metadata
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            val = (
+        rows = [
+            (
                 data.get('iupac_name'),
                 data.get('common_name'),
-                data['smiles_raw'], 
-                data['smiles_normalized'], 
-                data['inchi'], 
+                data['smiles_raw'],
+                data['smiles_normalized'],
+                data['inchi'],
                 data['inchi_key'],
-                data['molecular_formula'], 
-                data['molecular_weight'], 
-                data['fingerprint'], 
-                data['structure_2d_svg'],
-                sources_json # Store sources as JSON in metadata
+                data['molecular_formula'],
+                data['molecular_weight'],
+                data['fingerprint'],
+                compress_svg(data['structure_2d_svg']),
+                json.dumps(data.get('sources', [])) # Store sources as JSON in metadata
             )
-            cursor.execute(sql, val)
-            inserted_count += 1
-            print("  -> Successfully inserted.")
-
-        conn.commit()
+            for data in unique_compounds
+        ]
+
+        # The unique indexes in schema.sql (InChIKey, SMILES, common name) reject
+        # compounds that already exist, so no per-row duplicate check is needed
+        sql = """
+        INSERT OR IGNORE INTO compounds (
+            iupac_name, common_name, smiles_raw, smiles_normalized, inchi, inchi_key,
+            molecular_formula, molecular_weight, fingerprint, structure_2d_svg, metadata
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        with conn:
+            inserted_count = conn.executemany(sql, rows).rowcount
+        skipped_count += len(rows) - inserted_count
 
     except sqlite3.Error as err:
         print(f"A database error occurred: {err}")
-        conn.rollback()
     finally:
         conn.close()
         print("\nSeeding process finished.")